@@ -0,0 +1,147 @@
+import asyncio
+import os
+from typing import Dict, List, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from db import SessionLocal
+from models import InventoryItem
+
+# How long the coordinator keeps collecting adjustments after the first one
+# arrives, and the most it will apply in a single transaction.
+BATCH_WINDOW_MS = float(os.getenv("ADJUST_BATCH_WINDOW_MS", "5"))
+BATCH_MAX_SIZE = int(os.getenv("ADJUST_BATCH_MAX_SIZE", "256"))
+
+Adjustment = Tuple[str, int, asyncio.Future]
+
+# Queued by stop(): the batch collected so far is still applied, then the loop exits
+_STOP = object()
+
+
+class AdjustmentCoordinator:
+    """
+    Group-commits concurrent stock adjustments.
+    Each adjustment is validated against the running quantity of its SKU
+    inside the batch, all accepted ones are written in one transaction,
+    and every caller gets back its own result or error.
+    """
+
+    def __init__(self, window_ms: float = BATCH_WINDOW_MS, max_batch: int = BATCH_MAX_SIZE):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+        self.batches = 0
+        self.adjustments = 0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops accepting adjustments and lets the batch in progress commit and
+        resolve its callers. Cancelling mid-apply could commit a change on the
+        aiosqlite thread while its caller is told it failed.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._queue.put_nowait(_STOP)
+            await self._task
+            self._task = None
+        self._fail_pending()
+
+    def _fail_pending(self):
+        """Fails every caller still queued so none hang across shutdown."""
+        pending = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                pending.append(item)
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(HTTPException(status_code=503, detail="Inventory service is shutting down"))
+
+    async def submit(self, sku: str, quantity_delta: int) -> int:
+        """Queues an adjustment and waits for its batch; returns the new quantity."""
+        if self._task is None or self._stopping:
+            raise HTTPException(status_code=503, detail="Inventory adjustments are not being accepted")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((sku, quantity_delta, future))
+        return await future
+
+    async def _collect(self) -> Tuple[List[Adjustment], bool]:
+        """Returns the next batch and whether stop() was requested while collecting it."""
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = asyncio.get_running_loop().time() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect()
+            if not batch:
+                continue
+            try:
+                await self._apply(batch)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _apply(self, batch: List[Adjustment]):
+        skus = {sku for sku, _, _ in batch}
+        results: List[Tuple[asyncio.Future, int | HTTPException]] = []
+
+        async with SessionLocal() as session:
+            result = await session.execute(select(InventoryItem).where(InventoryItem.sku.in_(skus)))
+            items: Dict[str, InventoryItem] = {item.sku: item for item in result.scalars().all()}
+
+            # Validate in arrival order against the running quantity
+            for sku, quantity_delta, future in batch:
+                item = items.get(sku)
+                if not item:
+                    results.append((future, HTTPException(status_code=404, detail="Item not found")))
+                elif item.quantity + quantity_delta < 0:
+                    results.append((future, HTTPException(status_code=400, detail="Insufficient stock")))
+                else:
+                    item.quantity += quantity_delta
+                    results.append((future, item.quantity))
+
+            await session.commit()
+
+        self.batches += 1
+        self.adjustments += len(batch)
+
+        for future, outcome in results:
+            if future.done():
+                continue
+            if isinstance(outcome, HTTPException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
+coordinator = AdjustmentCoordinator()
@@ -2,7 +2,7 @@ import os
 from contextlib import asynccontextmanager
 from typing import List
 
-from fastapi import FastAPI, HTTPException, Request, Depends, Query
+from fastapi import FastAPI, Request, Depends, Query
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from db import engine, SessionLocal
 from models import Base, InventoryItem
 from health import router as health_router
+from adjustments import coordinator
 
 # ---------------------------
 # Lifespan
@@ -19,7 +20,9 @@ from health import router as health_router
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    coordinator.start()
     yield
+    await coordinator.stop()
 
 app = FastAPI(lifespan=lifespan)
 app.include_router(health_router)
@@ -99,26 +102,21 @@ async def get_inventory(
 @app.patch("/api/inventory/{sku}")
 async def update_inventory(
     sku: str,
-    quantity_delta: int,
-    session: AsyncSession = Depends(get_session)
+    quantity_delta: int
 ):
     """
     Adjusts inventory quantity for a given SKU.
+    Concurrent adjustments are group-committed by the coordinator.
     Returns the new quantity after update.
     """
-    result = await session.execute(
-        select(InventoryItem).where(InventoryItem.sku == sku)
-    )
-    item = result.scalar_one_or_none()
-
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-
-    if item.quantity + quantity_delta < 0:
-        raise HTTPException(status_code=400, detail="Insufficient stock")
+    new_quantity = await coordinator.submit(sku, quantity_delta)
+    return {"sku": sku, "new_quantity": new_quantity}
 
-    item.quantity += quantity_delta
-    await session.commit()
-    await session.refresh(item)
 
-    return {"sku": item.sku, "new_quantity": item.quantity}
+@app.get("/api/inventory/adjustments/stats")
+async def adjustment_stats():
+    return {
+        "batches": coordinator.batches,
+        "adjustments": coordinator.adjustments,
+        "pending": coordinator.pending
+    }
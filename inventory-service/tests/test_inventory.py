@@ -1,3 +1,7 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 import requests
 
 BASE_URL = "http://localhost:8000"
@@ -17,3 +21,54 @@ def test_inventory_item_structure_if_present():
         sample = data[0]
         expected_keys = {"name", "sku", "quantity", "price", "emoji"}
         assert expected_keys.issubset(sample.keys())
+
+def test_adjustment_unknown_sku_returns_404():
+    response = requests.patch(f"{BASE_URL}/api/inventory/DOES-NOT-EXIST", params={"quantity_delta": -1})
+    assert response.status_code == 404
+
+def test_adjustment_stats_available():
+    response = requests.get(f"{BASE_URL}/api/inventory/adjustments/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"batches", "adjustments", "pending"}.issubset(data.keys())
+
+def test_concurrent_adjustments_are_batched_and_validated():
+    inventory = requests.get(f"{BASE_URL}/inventory", headers={"accept": "application/json"}).json()["inventory"]
+    if not inventory:
+        pytest.skip("No inventory to adjust")
+    item = min(inventory, key=lambda i: i["quantity"])
+    sku, original = item["sku"], item["quantity"]
+
+    # Bring the SKU down to a small known quantity, then oversubscribe it
+    quantity = min(original, 5)
+    requests.patch(f"{BASE_URL}/api/inventory/{sku}", params={"quantity_delta": quantity - original})
+    n = quantity + 10
+
+    before = requests.get(f"{BASE_URL}/api/inventory/adjustments/stats").json()
+    barrier = threading.Barrier(n)
+
+    def decrement(_):
+        barrier.wait()
+        return requests.patch(f"{BASE_URL}/api/inventory/{sku}", params={"quantity_delta": -1})
+
+    try:
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            responses = list(pool.map(decrement, range(n)))
+        after = requests.get(f"{BASE_URL}/api/inventory/adjustments/stats").json()
+    finally:
+        current = next(i["quantity"] for i in requests.get(f"{BASE_URL}/inventory", headers={"accept": "application/json"}).json()["inventory"] if i["sku"] == sku)
+        requests.patch(f"{BASE_URL}/api/inventory/{sku}", params={"quantity_delta": original - current})
+
+    ok = [r for r in responses if r.status_code == 200]
+    rejected = [r for r in responses if r.status_code == 400]
+    assert len(ok) == quantity
+    assert len(rejected) == n - quantity
+
+    # Every accepted caller saw its own step of the running quantity
+    new_quantities = sorted((r.json()["new_quantity"] for r in ok), reverse=True)
+    assert new_quantities == list(range(quantity - 1, -1, -1))
+
+    adjustments = after["adjustments"] - before["adjustments"]
+    batches = after["batches"] - before["batches"]
+    assert adjustments >= n
+    assert batches < adjustments
@@ -0,0 +1,114 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, HTTPException
+
+router = APIRouter()
+
+
+class AdmissionLimiter:
+    """
+    Caps concurrent requests on a path: up to `max_in_flight` run at once,
+    up to `max_queue` wait for a slot, everything beyond that gets a 429.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float, retry_after: int):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    def _reject(self, reason: str):
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many concurrent {self.name} requests ({reason}), retry later",
+            headers={"Retry-After": str(self.retry_after)}
+        )
+
+    @asynccontextmanager
+    async def slot(self):
+        # Decide from the semaphore itself: acquiring an unlocked semaphore
+        # never yields, and `queued` is bumped before the first await, so a
+        # same-tick burst can't slip past the bound.
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        elif self.queued >= self.max_queue:
+            self.rejected_queue_full += 1
+            self._reject("queue full")
+        else:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                self._reject("queue timeout")
+            finally:
+                self.queued -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+# ---------------------------
+# Limiters (env-configurable)
+# ---------------------------
+RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+order_limiter = AdmissionLimiter(
+    "order",
+    max_in_flight=int(os.getenv("ORDERS_MAX_IN_FLIGHT", "16")),
+    max_queue=int(os.getenv("ORDERS_MAX_QUEUE", "64")),
+    queue_timeout=float(os.getenv("ORDERS_QUEUE_TIMEOUT", "5")),
+    retry_after=RETRY_AFTER_SECONDS
+)
+
+read_limiter = AdmissionLimiter(
+    "read",
+    max_in_flight=int(os.getenv("READS_MAX_IN_FLIGHT", "8")),
+    max_queue=int(os.getenv("READS_MAX_QUEUE", "16")),
+    queue_timeout=float(os.getenv("READS_QUEUE_TIMEOUT", "5")),
+    retry_after=RETRY_AFTER_SECONDS
+)
+
+
+# ---------------------------
+# Dependencies
+# ---------------------------
+async def admit_order():
+    async with order_limiter.slot():
+        yield
+
+
+async def admit_read():
+    async with read_limiter.slot():
+        yield
+
+
+@router.get("/admission")
+async def admission_stats():
+    return {"order": order_limiter.stats(), "read": read_limiter.stats()}
@@ -0,0 +1,191 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from db import engine
+from models import Base, OrderItem, OrderInventoryLink, ArchivedOrder, ArchivedOrderLink
+
+router = APIRouter()
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+# Gap between batches so order writes can take the SQLite write lock
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", "0.05"))
+
+orders = OrderItem.__table__
+order_items = OrderInventoryLink.__table__
+archived_orders = ArchivedOrder.__table__
+archived_order_items = ArchivedOrderLink.__table__
+
+
+async def ensure_unique_ids(conn: AsyncConnection):
+    """
+    Makes sure hot order ids can never collide with archived ones.
+    Tables created before AUTOINCREMENT are rebuilt with it (plain rowids
+    are reused once the highest rows are archived), and each table's id
+    sequence is moved past the highest id already in the archive.
+    """
+    schema_sql = dict((await conn.execute(text(
+        "SELECT name, sql FROM main.sqlite_master WHERE type = 'table' AND name IN ('orders', 'order_items')"
+    ))).all())
+
+    if any("AUTOINCREMENT" not in (sql or "").upper() for sql in schema_sql.values()):
+        # Rename old tables aside (dropping their indexes so names are free),
+        # create them fresh from the models, copy rows back, drop the old ones
+        for name in schema_sql:
+            index_names = (await conn.execute(text(
+                "SELECT name FROM main.sqlite_master WHERE type = 'index' AND tbl_name = :t AND sql IS NOT NULL"
+            ), {"t": name})).scalars().all()
+            for index_name in index_names:
+                await conn.execute(text(f'DROP INDEX main."{index_name}"'))
+            await conn.execute(text(f'ALTER TABLE main."{name}" RENAME TO "_{name}_old"'))
+
+        await conn.run_sync(Base.metadata.create_all, tables=[orders, order_items])
+        for table in (orders, order_items):
+            if table.name in schema_sql:
+                cols = ", ".join(f'"{c.name}"' for c in table.columns)
+                await conn.execute(text(f'INSERT INTO main."{table.name}" ({cols}) SELECT {cols} FROM main."_{table.name}_old"'))
+        for table in (order_items, orders):
+            if table.name in schema_sql:
+                await conn.execute(text(f'DROP TABLE main."_{table.name}_old"'))
+
+    for table, archived in ((orders, archived_orders), (order_items, archived_order_items)):
+        floor = max(
+            (await conn.execute(select(func.max(table.c.id)))).scalar() or 0,
+            (await conn.execute(select(func.max(archived.c.id)))).scalar() or 0,
+            (await conn.execute(text("SELECT seq FROM main.sqlite_sequence WHERE name = :t"), {"t": table.name})).scalar() or 0,
+        )
+        await conn.execute(text("DELETE FROM main.sqlite_sequence WHERE name = :t"), {"t": table.name})
+        await conn.execute(text("INSERT INTO main.sqlite_sequence (name, seq) VALUES (:t, :seq)"), {"t": table.name, "seq": floor})
+
+
+class OrderArchiver:
+    """
+    Periodically moves orders older than `after_days` (and their items)
+    from the hot tables into the attached archive database.
+    Each batch is one short transaction, so a crash never leaves an order
+    in both places or in neither.
+    """
+
+    def __init__(self, engine: AsyncEngine, after_days: int, batch_size: int, interval: float, pause: float):
+        self.engine = engine
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pause = pause
+        self._task: asyncio.Task | None = None
+
+        # Newest created_at that lives in the archive; None while it is empty
+        self.horizon: datetime | None = None
+        self.archived_orders = 0
+        self.runs = 0
+        self.last_error: str | None = None
+
+    def reaches_archive(self, since: datetime | None) -> bool:
+        """
+        True if a range starting at `since` (None = unbounded) may need archive
+        data: it starts at or before the newest archived order, or before the
+        current cutoff, so a batch could move rows out from under the read.
+        """
+        if since is None:
+            return True
+        cutoff = datetime.utcnow() - timedelta(days=self.after_days)
+        return since < cutoff or (self.horizon is not None and since <= self.horizon)
+
+    async def load_horizon(self):
+        async with self.engine.connect() as conn:
+            self.horizon = (await conn.execute(select(func.max(archived_orders.c.created_at)))).scalar()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(days=self.after_days)
+        moved = 0
+        while True:
+            count = await self._archive_batch(cutoff)
+            moved += count
+            if count < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        self.runs += 1
+        return moved
+
+    async def _archive_batch(self, cutoff: datetime) -> int:
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                select(orders.c.id, orders.c.created_at)
+                .where(orders.c.created_at < cutoff)
+                .order_by(orders.c.created_at)
+                .limit(self.batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return 0
+
+            order_ids = [row.id for row in rows]
+            order_cols = [c.name for c in orders.columns]
+            item_cols = [c.name for c in order_items.columns]
+
+            await conn.execute(insert(archived_orders).from_select(
+                order_cols, select(*orders.columns).where(orders.c.id.in_(order_ids))
+            ))
+            await conn.execute(insert(archived_order_items).from_select(
+                item_cols, select(*order_items.columns).where(order_items.c.order_id.in_(order_ids))
+            ))
+            await conn.execute(delete(order_items).where(order_items.c.order_id.in_(order_ids)))
+            await conn.execute(delete(orders).where(orders.c.id.in_(order_ids)))
+
+        newest = rows[-1].created_at
+        if self.horizon is None or newest > self.horizon:
+            self.horizon = newest
+        self.archived_orders += len(rows)
+        return len(rows)
+
+    def stats(self) -> dict:
+        return {
+            "after_days": self.after_days,
+            "batch_size": self.batch_size,
+            "horizon": self.horizon.isoformat() if self.horizon else None,
+            "archived_orders": self.archived_orders,
+            "runs": self.runs,
+            "last_error": self.last_error,
+        }
+
+
+archiver = OrderArchiver(
+    engine,
+    after_days=ARCHIVE_AFTER_DAYS,
+    batch_size=ARCHIVE_BATCH_SIZE,
+    interval=ARCHIVE_INTERVAL_SECONDS,
+    pause=ARCHIVE_BATCH_PAUSE_SECONDS
+)
+
+
+@router.get("/archive")
+async def archive_stats():
+    return archiver.stats()
@@ -1,4 +1,5 @@
 import os
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
@@ -6,7 +7,24 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 # Use env var or fallback
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///data/inventory.db")
 
-engine = create_async_engine("sqlite+aiosqlite:////data/inventory.db", connect_args={"check_same_thread": False})
+# Cold storage for archived orders, attached to every connection as schema "archive"
+ARCHIVE_DATABASE_PATH = os.getenv("ARCHIVE_DATABASE_PATH", "/data/orders_archive.db")
+
+
+def create_archive_engine(url: str, archive_path: str):
+    """Async engine whose connections all have the archive database attached."""
+    engine = create_async_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def attach_archive(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+        cursor.close()
+
+    return engine
+
+
+engine = create_archive_engine("sqlite+aiosqlite:////data/inventory.db", ARCHIVE_DATABASE_PATH)
 
 SessionLocal = sessionmaker(
     bind=engine,
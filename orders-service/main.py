@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from db import engine
-from models import Base
+from models import Base, OrderItem
 from health import router as health_router
-from routers import orders
+from routers import orders, analytics
 from sse import router as sse_router
+from admission import router as admission_router
+from archive import router as archive_router, archiver, ensure_unique_ids
 
 # ---------------------------
 # Lifespan
@@ -13,7 +15,14 @@ from sse import router as sse_router
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips indexes added to tables that already exist
+        for index in OrderItem.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
+        await ensure_unique_ids(conn)
+    await archiver.load_horizon()
+    archiver.start()
     yield
+    await archiver.stop()
 
 
 # ---------------------------
@@ -24,4 +33,7 @@ app = FastAPI(lifespan=lifespan)
 # Routers
 app.include_router(health_router)
 app.include_router(orders.router, prefix="/orders", tags=["orders"])
+app.include_router(analytics.router, prefix="/orders/analytics", tags=["orders-analytics"])
 app.include_router(sse_router, prefix="/orders", tags=["orders-stream"])
+app.include_router(admission_router, prefix="/orders", tags=["orders-admission"])
+app.include_router(archive_router, prefix="/orders", tags=["orders-archive"])
@@ -16,9 +16,11 @@ class Customer(Base):
 
 class OrderItem(Base):
     __tablename__ = "orders"
+    # AUTOINCREMENT: ids must never be reused once their rows move to the archive
+    __table_args__ = {"sqlite_autoincrement": True}
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String, index=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     customer_id = Column(Integer, ForeignKey("customers.id"))
 
     customer = relationship("Customer", back_populates="orders")
@@ -27,6 +29,7 @@ class OrderItem(Base):
 
 class OrderInventoryLink(Base):
     __tablename__ = "order_items"
+    __table_args__ = {"sqlite_autoincrement": True}
     id = Column(Integer, primary_key=True, index=True)
     sku = Column(String, index=True)
     quantity = Column(Integer, nullable=False)
@@ -34,3 +37,31 @@ class OrderInventoryLink(Base):
 
     order_id = Column(Integer, ForeignKey("orders.id"))
     order = relationship("OrderItem", back_populates="items")
+
+
+# ---------------------------
+# Archive (attached database "archive")
+# ---------------------------
+class ArchivedOrder(Base):
+    __tablename__ = "orders"
+    __table_args__ = {"schema": "archive"}
+    id = Column(Integer, primary_key=True)
+    order_number = Column(String, index=True, nullable=False)
+    created_at = Column(DateTime, index=True)
+    customer_id = Column(Integer)
+
+    # Customers stay in the main database; SQLite can't enforce FKs across attached files
+    customer = relationship("Customer", primaryjoin="foreign(ArchivedOrder.customer_id) == Customer.id", viewonly=True)
+    items = relationship("ArchivedOrderLink", back_populates="order")
+
+
+class ArchivedOrderLink(Base):
+    __tablename__ = "order_items"
+    __table_args__ = {"schema": "archive"}
+    id = Column(Integer, primary_key=True)
+    sku = Column(String, index=True)
+    quantity = Column(Integer, nullable=False)
+    price_at_order = Column(Float, nullable=False)
+
+    order_id = Column(Integer, ForeignKey("archive.orders.id"), index=True)
+    order = relationship("ArchivedOrder", back_populates="items")
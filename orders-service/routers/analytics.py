@@ -0,0 +1,275 @@
+import os
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Literal
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_session
+from models import Customer, OrderItem, OrderInventoryLink, ArchivedOrder, ArchivedOrderLink
+from admission import admit_read
+from archive import archiver
+
+router = APIRouter(dependencies=[Depends(admit_read)])
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+ROLLUP_CACHE_MAX_ENTRIES = int(os.getenv("ROLLUP_CACHE_MAX_ENTRIES", "4096"))
+
+# Per-day rollups keyed by (kind, day), least recently used first. Only
+# closed (UTC) days on or after the first order are cached, so today's
+# bucket is always recomputed and past days are not, while they stay cached.
+_rollup_cache: OrderedDict = OrderedDict()
+_earliest_day: date | None = None
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def _utc_today() -> date:
+    return datetime.utcnow().date()
+
+
+def _resolve_days(start: date | None, end: date | None) -> List[date]:
+    end = end or _utc_today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+    span = (end - start).days + 1
+    if span > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range may not exceed {MAX_RANGE_DAYS} days")
+    return [start + timedelta(days=i) for i in range(span)]
+
+
+async def _earliest_order_day(session: AsyncSession) -> date | None:
+    """Day of the first order ever placed; fixed once known, since orders are only ever added later."""
+    global _earliest_day
+    if _earliest_day is None:
+        first = None
+        for order_model in (OrderItem, ArchivedOrder):
+            value = (await session.execute(select(func.min(order_model.created_at)))).scalar()
+            if value is not None and (first is None or value < first):
+                first = value
+        _earliest_day = first.date() if first else None
+    return _earliest_day
+
+
+def _cache_put(key: tuple, value: Any):
+    _rollup_cache[key] = value
+    _rollup_cache.move_to_end(key)
+    while len(_rollup_cache) > ROLLUP_CACHE_MAX_ENTRIES:
+        _rollup_cache.popitem(last=False)
+
+
+async def _cached_days(session: AsyncSession, kind: str, days: List[date], fetch: Callable, empty: Callable) -> Dict[date, Any]:
+    """
+    Returns {day: rollup} for every requested day. Days missing from the
+    cache are fetched with a single grouped query over their time span;
+    days before the first order are empty and never queried or cached.
+    """
+    today = _utc_today()
+    earliest = await _earliest_order_day(session)
+    if earliest is None:
+        return {d: empty() for d in days}
+
+    rollups: Dict[date, Any] = {}
+    missing = []
+    for d in days:
+        if d < earliest:
+            rollups[d] = empty()
+        elif d < today and (kind, d) in _rollup_cache:
+            _rollup_cache.move_to_end((kind, d))
+            rollups[d] = _rollup_cache[(kind, d)]
+        else:
+            missing.append(d)
+
+    if missing:
+        lo = datetime.combine(min(missing), time.min)
+        hi = datetime.combine(max(missing) + timedelta(days=1), time.min)
+        fetched = await fetch(lo, hi)
+        for d in missing:
+            rollups[d] = fetched.get(d, empty())
+            if d < today:
+                _cache_put((kind, d), rollups[d])
+
+    return rollups
+
+
+def _order_lines(lo: datetime, hi: datetime):
+    """
+    One row per order line in [lo, hi) as a single subquery, with archived
+    lines UNION ALL'd in when the range reaches back into the archive.
+    Being one statement, it reads hot and archive tables as one snapshot.
+    """
+    sources = [(OrderItem, OrderInventoryLink)]
+    if archiver.reaches_archive(lo):
+        sources.append((ArchivedOrder, ArchivedOrderLink))
+
+    parts = [
+        select(
+            func.date(order_model.created_at).label("day"),
+            order_model.id.label("order_id"),
+            order_model.customer_id.label("customer_id"),
+            item_model.sku.label("sku"),
+            item_model.quantity.label("quantity"),
+            (item_model.quantity * item_model.price_at_order).label("revenue")
+        )
+        .join(item_model, item_model.order_id == order_model.id)
+        .where(order_model.created_at >= lo, order_model.created_at < hi)
+        for order_model, item_model in sources
+    ]
+    return (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+
+
+def _sales_fetcher(session: AsyncSession, group_by: str) -> Callable:
+    async def fetch(lo: datetime, hi: datetime) -> Dict[date, Dict[Any, tuple]]:
+        lines = _order_lines(lo, hi)
+        key_col = {"day": None, "sku": lines.c.sku, "customer": lines.c.customer_id}[group_by]
+        group_cols = [lines.c.day] if key_col is None else [lines.c.day, key_col]
+        result = await session.execute(
+            select(*group_cols, func.sum(lines.c.revenue), func.sum(lines.c.quantity)).group_by(*group_cols)
+        )
+
+        rollup: Dict[date, Dict[Any, tuple]] = defaultdict(dict)
+        for row in result.all():
+            day = date.fromisoformat(row[0])
+            key = None if key_col is None else row[1]
+            rollup[day][key] = (float(row[-2] or 0), int(row[-1] or 0))
+        return rollup
+
+    return fetch
+
+
+def _basket_fetcher(session: AsyncSession) -> Callable:
+    async def fetch(lo: datetime, hi: datetime) -> Dict[date, np.ndarray]:
+        lines = _order_lines(lo, hi)
+        result = await session.execute(
+            select(lines.c.day, func.sum(lines.c.quantity)).group_by(lines.c.order_id, lines.c.day)
+        )
+
+        sizes: Dict[date, List[int]] = defaultdict(list)
+        for day, units in result.all():
+            sizes[date.fromisoformat(day)].append(int(units or 0))
+        return {day: np.asarray(values, dtype=np.int64) for day, values in sizes.items()}
+
+    return fetch
+
+
+def _merge_by_key(rollups: Dict[date, Dict[Any, tuple]]) -> tuple:
+    """Collapses per-day rollups into parallel (keys, revenue, units) arrays."""
+    totals: Dict[Any, List[float]] = defaultdict(lambda: [0.0, 0])
+    for buckets in rollups.values():
+        for key, (revenue, units) in buckets.items():
+            totals[key][0] += revenue
+            totals[key][1] += units
+    keys = list(totals.keys())
+    revenue = np.array([totals[k][0] for k in keys], dtype=np.float64)
+    units = np.array([totals[k][1] for k in keys], dtype=np.int64)
+    return keys, revenue, units
+
+
+def _moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean; the first days average over however many days exist."""
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    idx = np.arange(1, len(values) + 1)
+    lower = np.maximum(idx - window, 0)
+    return (csum[idx] - csum[lower]) / (idx - lower)
+
+
+# ---------------------------
+# Routes
+# ---------------------------
+@router.get("/revenue")
+async def revenue(
+    session: AsyncSession = Depends(get_session),
+    group_by: Literal["day", "sku", "customer"] = Query("day"),
+    start: date = Query(None),
+    end: date = Query(None),
+    window: int = Query(7, ge=1, le=90, description="Moving-average window in days (group_by=day)")
+):
+    days = _resolve_days(start, end)
+    rollups = await _cached_days(session, f"sales:{group_by}", days, _sales_fetcher(session, group_by), dict)
+
+    if group_by == "day":
+        revenue = np.array([rollups[d].get(None, (0.0, 0))[0] for d in days], dtype=np.float64)
+        units = np.array([rollups[d].get(None, (0.0, 0))[1] for d in days], dtype=np.int64)
+        moving = _moving_average(revenue, window)
+        rows = [
+            {"day": d.isoformat(), "revenue": round(float(r), 2), "units": int(u), "revenue_moving_avg": round(float(m), 2)}
+            for d, r, u, m in zip(days, revenue, units, moving)
+        ]
+        return {"group_by": group_by, "start": days[0].isoformat(), "end": days[-1].isoformat(), "window": window, "rows": rows}
+
+    keys, revenue, units = _merge_by_key(rollups)
+    order = np.argsort(-revenue, kind="stable")
+
+    nicknames = {}
+    if group_by == "customer" and keys:
+        result = await session.execute(select(Customer.id, Customer.nickname).where(Customer.id.in_([k for k in keys if k is not None])))
+        nicknames = dict(result.all())
+
+    rows = []
+    for i in order:
+        row = {group_by: keys[i], "revenue": round(float(revenue[i]), 2), "units": int(units[i])}
+        if group_by == "customer":
+            row["nickname"] = nicknames.get(keys[i])
+        rows.append(row)
+
+    return {"group_by": group_by, "start": days[0].isoformat(), "end": days[-1].isoformat(), "rows": rows}
+
+
+@router.get("/top-skus")
+async def top_skus(
+    session: AsyncSession = Depends(get_session),
+    n: int = Query(10, ge=1, le=500),
+    by: Literal["revenue", "units"] = Query("revenue"),
+    start: date = Query(None),
+    end: date = Query(None)
+):
+    days = _resolve_days(start, end)
+    rollups = await _cached_days(session, "sales:sku", days, _sales_fetcher(session, "sku"), dict)
+
+    skus, revenue, units = _merge_by_key(rollups)
+    metric = revenue if by == "revenue" else units
+    top = np.argsort(-metric, kind="stable")[:n]
+    total = float(metric.sum()) or 1.0
+
+    return {
+        "by": by,
+        "start": days[0].isoformat(),
+        "end": days[-1].isoformat(),
+        "skus": [
+            {"sku": skus[i], "revenue": round(float(revenue[i]), 2), "units": int(units[i]), "share": round(float(metric[i]) / total, 4)}
+            for i in top
+        ]
+    }
+
+
+@router.get("/basket-sizes")
+async def basket_sizes(
+    session: AsyncSession = Depends(get_session),
+    start: date = Query(None),
+    end: date = Query(None)
+):
+    days = _resolve_days(start, end)
+    rollups = await _cached_days(session, "baskets", days, _basket_fetcher(session), lambda: np.empty(0, dtype=np.int64))
+
+    sizes = np.concatenate([rollups[d] for d in days])
+    response = {"start": days[0].isoformat(), "end": days[-1].isoformat(), "orders": int(sizes.size)}
+    if sizes.size == 0:
+        return {**response, "mean": None, "percentiles": {}, "distribution": {}}
+
+    p50, p75, p90, p99 = np.percentile(sizes, [50, 75, 90, 99])
+    counts = np.bincount(sizes)
+    present = np.nonzero(counts)[0]
+
+    return {
+        **response,
+        "mean": round(float(sizes.mean()), 2),
+        "percentiles": {"p50": float(p50), "p75": float(p75), "p90": float(p90), "p99": float(p99)},
+        "distribution": {str(int(size)): int(counts[size]) for size in present}
+    }
@@ -0,0 +1,43 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from admission import AdmissionLimiter
+
+
+def run_burst(limiter: AdmissionLimiter, n: int, hold: float = 0.05) -> list:
+    async def request():
+        try:
+            async with limiter.slot():
+                await asyncio.sleep(hold)
+            return 200
+        except HTTPException as e:
+            return e
+
+    async def burst():
+        return await asyncio.gather(*[request() for _ in range(n)])
+
+    return asyncio.run(burst())
+
+
+def test_burst_beyond_queue_is_rejected():
+    limiter = AdmissionLimiter("test", max_in_flight=2, max_queue=2, queue_timeout=5, retry_after=3)
+    results = run_burst(limiter, 6)
+
+    assert results.count(200) == 4
+    rejected = [r for r in results if r != 200]
+    assert len(rejected) == 2
+    assert all(r.status_code == 429 and r.headers["Retry-After"] == "3" for r in rejected)
+
+    stats = limiter.stats()
+    assert stats["admitted"] == 4
+    assert stats["rejected_queue_full"] == 2
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+
+def test_queue_timeout_is_rejected():
+    limiter = AdmissionLimiter("test", max_in_flight=1, max_queue=5, queue_timeout=0.01, retry_after=1)
+    results = run_burst(limiter, 3, hold=0.1)
+
+    assert results.count(200) == 1
+    assert limiter.stats()["rejected_timeout"] == 2
@@ -0,0 +1,143 @@
+import asyncio
+from datetime import date, datetime, time
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from db import create_archive_engine
+from models import Base, Customer, OrderItem, OrderInventoryLink
+from routers import analytics
+
+TODAY = date(2026, 3, 10)
+DAY1, DAY2 = date(2026, 3, 8), date(2026, 3, 9)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(analytics, "_utc_today", lambda: TODAY)
+    monkeypatch.setattr(analytics, "_earliest_day", None)
+    analytics._rollup_cache.clear()
+    yield
+    analytics._rollup_cache.clear()
+
+
+def make_order(day: date, customer: Customer, lines: list) -> OrderItem:
+    return OrderItem(
+        order_number=f"{day}-{customer.nickname}",
+        customer=customer,
+        created_at=datetime.combine(day, time(12)),
+        items=[OrderInventoryLink(sku=sku, quantity=qty, price_at_order=price) for sku, qty, price in lines]
+    )
+
+
+def run_with_orders(tmp_path, scenario):
+    """Seeds known orders over three days into a temp DB and runs `scenario(session)`."""
+    async def run():
+        engine = create_archive_engine(f"sqlite+aiosqlite:///{tmp_path / 'orders.db'}", str(tmp_path / "archive.db"))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            alice, bob = Customer(name="Alice", nickname="alice"), Customer(name="Bob", nickname="bob")
+            session.add_all([
+                make_order(DAY1, alice, [("SKU1", 2, 10.0), ("SKU2", 1, 5.0)]),
+                make_order(DAY2, bob, [("SKU1", 1, 10.0)]),
+                make_order(TODAY, alice, [("SKU2", 4, 5.0)]),
+                make_order(TODAY, bob, [("SKU1", 3, 10.0), ("SKU2", 2, 5.0)]),
+            ])
+            await session.commit()
+            await scenario(session)
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_revenue_by_day_sku_and_customer(tmp_path):
+    async def scenario(session):
+        by_day = await analytics.revenue(session=session, group_by="day", start=DAY1, end=TODAY, window=2)
+        assert [(r["day"], r["revenue"], r["units"]) for r in by_day["rows"]] == [
+            (DAY1.isoformat(), 25.0, 3), (DAY2.isoformat(), 10.0, 1), (TODAY.isoformat(), 60.0, 9)
+        ]
+        assert [r["revenue_moving_avg"] for r in by_day["rows"]] == [25.0, 17.5, 35.0]
+
+        by_sku = await analytics.revenue(session=session, group_by="sku", start=DAY1, end=TODAY, window=7)
+        assert [(r["sku"], r["revenue"], r["units"]) for r in by_sku["rows"]] == [("SKU1", 60.0, 6), ("SKU2", 35.0, 7)]
+
+        by_customer = await analytics.revenue(session=session, group_by="customer", start=DAY1, end=TODAY, window=7)
+        assert [(r["nickname"], r["revenue"], r["units"]) for r in by_customer["rows"]] == [("bob", 50.0, 6), ("alice", 45.0, 7)]
+
+        top = await analytics.top_skus(session=session, n=1, by="units", start=DAY1, end=TODAY)
+        assert [(s["sku"], s["units"]) for s in top["skus"]] == [("SKU2", 7)]
+
+    run_with_orders(tmp_path, scenario)
+
+
+def test_moving_average_is_trailing():
+    result = analytics._moving_average(np.array([2.0, 4.0, 6.0, 8.0]), 3)
+    assert result.tolist() == [2.0, 3.0, 4.0, 6.0]
+
+
+def test_basket_sizes(tmp_path):
+    async def scenario(session):
+        result = await analytics.basket_sizes(session=session, start=DAY1, end=TODAY)
+        sizes = [3, 1, 4, 5]
+        assert result["orders"] == 4
+        assert result["mean"] == 3.25
+        assert result["percentiles"]["p50"] == float(np.percentile(sizes, 50)) == 3.5
+        assert result["percentiles"]["p90"] == pytest.approx(float(np.percentile(sizes, 90)))
+        assert result["distribution"] == {"1": 1, "3": 1, "4": 1, "5": 1}
+
+    run_with_orders(tmp_path, scenario)
+
+
+def test_closed_days_come_from_cache_and_today_is_recomputed(tmp_path):
+    async def scenario(session):
+        await analytics.revenue(session=session, group_by="day", start=DAY1, end=TODAY, window=7)
+        assert ("sales:day", DAY1) in analytics._rollup_cache
+        assert ("sales:day", TODAY) not in analytics._rollup_cache
+
+        bob = (await session.execute(select(Customer).where(Customer.nickname == "bob"))).scalar_one()
+        session.add_all([make_order(DAY1, bob, [("SKU1", 1, 100.0)]), make_order(TODAY, bob, [("SKU1", 1, 100.0)])])
+        await session.commit()
+
+        rows = (await analytics.revenue(session=session, group_by="day", start=DAY1, end=TODAY, window=7))["rows"]
+        assert rows[0]["revenue"] == 25.0   # closed day served from the cache
+        assert rows[-1]["revenue"] == 160.0  # today picks up the new order
+
+    run_with_orders(tmp_path, scenario)
+
+
+def test_days_before_first_order_are_not_cached(tmp_path):
+    async def scenario(session):
+        result = await analytics.revenue(session=session, group_by="day", start=date(2026, 3, 1), end=TODAY, window=7)
+        assert len(result["rows"]) == 10
+        assert all(day >= DAY1 for _, day in analytics._rollup_cache)
+
+    run_with_orders(tmp_path, scenario)
+
+
+def test_rollup_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(analytics, "ROLLUP_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(analytics, "_earliest_day", DAY1)
+    d1, d2, d3 = DAY1, DAY2, TODAY
+    fetched = []
+
+    async def fetch(lo, hi):
+        fetched.append(lo.date())
+        return {}
+
+    async def scenario():
+        await analytics._cached_days(None, "k", [d1], fetch, dict)
+        await analytics._cached_days(None, "k", [d2], fetch, dict)
+        await analytics._cached_days(None, "k", [d1], fetch, dict)  # hit: d1 becomes most recent
+        monkeypatch.setattr(analytics, "_utc_today", lambda: date(2026, 3, 11))  # d3 is now closed
+        await analytics._cached_days(None, "k", [d3], fetch, dict)
+
+    asyncio.run(scenario())
+    assert fetched == [d1, d2, d3]
+    assert list(analytics._rollup_cache) == [("k", d1), ("k", d3)]
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from db import create_archive_engine
+from models import Base, OrderItem, OrderInventoryLink, ArchivedOrder
+from archive import OrderArchiver, ensure_unique_ids
+from routers import orders as orders_router
+
+
+def make_engine(tmp_path):
+    return create_archive_engine(f"sqlite+aiosqlite:///{tmp_path / 'orders.db'}", str(tmp_path / "archive.db"))
+
+
+async def add_orders(engine, count: int, age_days: int) -> list:
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        orders = [
+            OrderItem(
+                order_number=f"T{i}",
+                created_at=datetime.utcnow() - timedelta(days=age_days),
+                items=[OrderInventoryLink(sku="SKU1", quantity=1, price_at_order=1.0)]
+            )
+            for i in range(count)
+        ]
+        session.add_all(orders)
+        await session.commit()
+        return [order.id for order in orders]
+
+
+async def count_rows(engine, model) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar()
+
+
+def test_archive_everything_then_archive_new_orders(tmp_path):
+    async def scenario():
+        engine = make_engine(tmp_path)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await ensure_unique_ids(conn)
+
+        archiver = OrderArchiver(engine, after_days=30, batch_size=2, interval=3600, pause=0)
+        first_ids = await add_orders(engine, 3, age_days=60)
+        assert await archiver.run_once() == 3
+        assert await count_rows(engine, OrderItem) == 0
+
+        # With every hot row archived, new orders must not reuse old ids
+        new_ids = await add_orders(engine, 1, age_days=60)
+        assert new_ids[0] > max(first_ids)
+        assert await archiver.run_once() == 1
+        assert await count_rows(engine, ArchivedOrder) == 4
+
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_legacy_tables_are_rebuilt_with_autoincrement(tmp_path):
+    async def scenario():
+        engine = make_engine(tmp_path)
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE orders (id INTEGER NOT NULL, order_number VARCHAR NOT NULL, "
+                "created_at DATETIME, customer_id INTEGER, PRIMARY KEY (id))"
+            ))
+            await conn.execute(text("CREATE INDEX ix_orders_order_number ON orders (order_number)"))
+            await conn.execute(text(
+                "CREATE TABLE order_items (id INTEGER NOT NULL, sku VARCHAR, quantity INTEGER NOT NULL, "
+                "price_at_order FLOAT NOT NULL, order_id INTEGER, PRIMARY KEY (id), FOREIGN KEY(order_id) REFERENCES orders (id))"
+            ))
+            await conn.execute(text("INSERT INTO orders (id, order_number, created_at) VALUES (7, 'OLD', '2020-01-01 00:00:00')"))
+            await conn.execute(text("INSERT INTO order_items (id, sku, quantity, price_at_order, order_id) VALUES (9, 'SKU1', 1, 1.0, 7)"))
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await ensure_unique_ids(conn)
+            schema = (await conn.execute(text("SELECT sql FROM main.sqlite_master WHERE name IN ('orders', 'order_items')"))).scalars().all()
+            assert all("AUTOINCREMENT" in sql for sql in schema)
+
+        assert await count_rows(engine, OrderItem) == 1
+        assert await count_rows(engine, OrderInventoryLink) == 1
+        assert (await add_orders(engine, 1, age_days=0))[0] == 8
+
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_orders_with_inventory_reads_archive_only_for_ranges(tmp_path, monkeypatch):
+    async def no_inventory():
+        return [], None
+
+    monkeypatch.setattr(orders_router, "fetch_inventory", no_inventory)
+
+    async def order_numbers(session, since=None):
+        response = await orders_router.orders_with_inventory(
+            request=None, session=session, format="json", highlight=None, since=since, until=None
+        )
+        return [order["order_number"] for order in json.loads(response.body)["orders"]]
+
+    async def scenario():
+        engine = make_engine(tmp_path)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await ensure_unique_ids(conn)
+
+        await add_orders(engine, 2, age_days=60)
+        await OrderArchiver(engine, after_days=30, batch_size=10, interval=3600, pause=0).run_once()
+        hot_ids = await add_orders(engine, 3, age_days=0)
+
+        # Simulate a batch committing between the hot and archive loads
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "INSERT INTO archive.orders SELECT * FROM main.orders WHERE id = :id"
+            ), {"id": hot_ids[0]})
+
+        session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            assert len(await order_numbers(session)) == 3
+            everything = await order_numbers(session, since=(datetime.utcnow() - timedelta(days=365)).date())
+            assert len(everything) == 5
+
+        await engine.dispose()
+
+    asyncio.run(scenario())
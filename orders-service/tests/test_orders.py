@@ -36,3 +36,53 @@ def test_get_orders_with_inventory_json():
         item = data["inventory"][0]
         expected_keys = {"sku", "name", "quantity", "price", "emoji"}
         assert expected_keys.issubset(item.keys())
+
+def test_admission_stats():
+    response = requests.get(f"{BASE_URL}/orders/admission")
+    assert response.status_code == 200
+
+    data = response.json()
+    for limiter in ("order", "read"):
+        assert limiter in data
+        expected_keys = {"in_flight", "queue_depth", "rejected_queue_full", "rejected_timeout"}
+        assert expected_keys.issubset(data[limiter].keys())
+
+def test_revenue_by_day():
+    response = requests.get(f"{BASE_URL}/orders/analytics/revenue", params={"group_by": "day"})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert isinstance(data["rows"], list)
+    if data["rows"]:
+        expected_keys = {"day", "revenue", "units", "revenue_moving_avg"}
+        assert expected_keys.issubset(data["rows"][0].keys())
+
+def test_top_skus_and_basket_sizes():
+    response = requests.get(f"{BASE_URL}/orders/analytics/top-skus", params={"n": 5})
+    assert response.status_code == 200
+    assert len(response.json()["skus"]) <= 5
+
+    response = requests.get(f"{BASE_URL}/orders/analytics/basket-sizes")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"orders", "mean", "percentiles", "distribution"}.issubset(data.keys())
+
+def test_archive_stats():
+    response = requests.get(f"{BASE_URL}/orders/archive")
+    assert response.status_code == 200
+    assert {"after_days", "horizon", "archived_orders"}.issubset(response.json().keys())
+
+def test_orders_with_inventory_since():
+    response = requests.get(
+        f"{BASE_URL}/orders/orders-with-inventory",
+        params={"format": "json", "since": "2000-01-01"}
+    )
+    assert response.status_code == 200
+    assert isinstance(response.json()["orders"], list)
+
+def test_analytics_rejects_unknown_grouping():
+    response = requests.get(f"{BASE_URL}/orders/analytics/revenue", params={"group_by": "bogus"})
+    assert response.status_code == 422
+
+    response = requests.get(f"{BASE_URL}/orders/analytics/top-skus", params={"by": "bogus"})
+    assert response.status_code == 422